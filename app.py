@@ -1,48 +1,190 @@
 import streamlit as st
 import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+try:
+    import talib
+except ImportError:
+    talib = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Indicator cores: when numba is installed, fused single-pass loops (the MACD
+# kernel keeps the EMA12/EMA26/Signal recurrences in registers, the RSI kernel
+# keeps running gain/loss sums); otherwise the pandas ewm/rolling engines
+if njit is not None:
+    # Eagerly compiled for the fixed (12, 26, 9) spans: the smoothing factors
+    # 2/13, 2/27 and 2/10 are literals so LLVM can constant-fold them and fuse
+    # the a*x + (1-a)*y updates into FMAs under fastmath
+    @njit('float64[:,:](float64[:])', cache=True, fastmath=True)
+    def _macd_kernel_jit(close):
+        n = close.size
+        out = np.empty((n, 3))
+        e12 = close[0]
+        e26 = close[0]
+        s = 0.0
+        for i in range(n):
+            e12 = 0.15384615384615385 * close[i] + 0.8461538461538462 * e12
+            e26 = 0.07407407407407407 * close[i] + 0.9259259259259259 * e26
+            m = e12 - e26
+            s = m if i == 0 else 0.2 * m + 0.8 * s
+            out[i, 0] = m
+            out[i, 1] = s
+            out[i, 2] = m - s
+        return out
+
+    def _macd_kernel(close):
+        out = _macd_kernel_jit(close)
+        return out[:, 0], out[:, 1], out[:, 2]
+
+    @njit(cache=True)
+    def _rsi_kernel(close, window):
+        n = close.size
+        out = np.full(n, np.nan)
+        gains = np.zeros(n)
+        losses = np.zeros(n)
+        gain_sum = 0.0
+        loss_sum = 0.0
+        for i in range(1, n):
+            delta = close[i] - close[i - 1]
+            gains[i] = delta if delta > 0 else 0.0
+            losses[i] = -delta if delta < 0 else 0.0
+            gain_sum += gains[i]
+            loss_sum += losses[i]
+            if i >= window:
+                gain_sum -= gains[i - window]
+                loss_sum -= losses[i - window]
+            if i >= window - 1:
+                if loss_sum == 0.0:
+                    out[i] = np.nan if gain_sum == 0.0 else 100.0
+                else:
+                    out[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+        return out
+else:
+    try:
+        from scipy.signal import lfilter
+
+        # adjust=False EWMA is a first-order IIR filter; lfilter runs it in C
+        # with no JIT warm-up
+        def _ewm_adjfalse(x, span):
+            alpha = 2.0 / (span + 1)
+            return lfilter([alpha], [1.0, alpha - 1.0], x, zi=[x[0] * (1 - alpha)])[0]
+    except ImportError:
+        def _ewm_adjfalse(x, span):
+            return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+    def _macd_kernel(close):
+        macd = _ewm_adjfalse(close, 12) - _ewm_adjfalse(close, 26)
+        signal = _ewm_adjfalse(macd, 9)
+        return macd, signal, macd - signal
+
+    def _rsi_kernel(close, window):
+        delta = pd.Series(close).diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+        rs = gain / loss
+        return (100 - (100 / (1 + rs))).to_numpy()
+
+
+# Cached fetch so reruns for the same (ticker, period, interval) skip the network round-trip
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _fetch(ticker, period, interval):
+    return yf.download(ticker, period=period, interval=interval,
+                       progress=False, threads=True, auto_adjust=False,
+                       group_by='ticker')
+
 
 # Function to get stock data
 def get_stock_data(ticker, period='1y', interval='1d'):
-    return yf.download(ticker, period=period, interval=interval)
-
-
-# Function to calculate MACD
-def calculate_macd(data):
-    data['EMA12'] = data['Close'].ewm(span=12, adjust=False).mean()
-    data['EMA26'] = data['Close'].ewm(span=26, adjust=False).mean()
-    data['MACD'] = data['EMA12'] - data['EMA26']
-    data['Signal Line'] = data['MACD'].ewm(span=9, adjust=False).mean()
-    data['Hist'] = data['MACD'] - data['Signal Line']
-    return data
-
+    return _fetch(ticker, period, interval)
 
-# Function to calculate RSI
-def calculate_rsi(data, window=14):
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    data['RSI'] = 100 - (100 / (1 + rs))
-    return data
 
-
-# Function to identify MACD crossovers
+# Function to identify MACD crossovers (vectorized sign-diff, no Python loop)
 def identify_macd_crossovers(data):
-    crossovers = []
-    for i in range(1, len(data)):
-        if data['MACD'].iloc[i - 1] < data['Signal Line'].iloc[i - 1] and data['MACD'].iloc[i] > \
-                data['Signal Line'].iloc[i]:
-            crossovers.append((data.index[i], data['Close'].iloc[i], 'Bullish'))
-        elif data['MACD'].iloc[i - 1] > data['Signal Line'].iloc[i - 1] and data['MACD'].iloc[i] < \
-                data['Signal Line'].iloc[i]:
-            crossovers.append((data.index[i], data['Close'].iloc[i], 'Bearish'))
+    macd = data['MACD'].to_numpy()
+    signal = data['Signal Line'].to_numpy()
+    sign = np.sign(macd - signal)
+    change = np.diff(sign, prepend=sign[:1])
+    mask = np.abs(change) == 2
+    crossovers = data.loc[mask, ['Close']].rename(columns={'Close': 'Close Price'})
+    crossovers['Type'] = np.where(change[mask] == 2, 'Bullish', 'Bearish')
     return crossovers
 
 
+# Function to calculate forward price changes after each date (one vectorized shift per horizon)
+def calculate_price_changes(data, horizons=(5, 14, 30, 45)):
+    close = data['Close']
+    return pd.concat([(close.shift(-d) / close - 1) * 100 for d in horizons],
+                     axis=1, keys=[f'{d}D Change (%)' for d in horizons])
+
+
+# Cached indicator pipeline keyed on the scalar inputs, so reruns that don't
+# change the ticker/period/interval skip the MACD/RSI/crossover recomputation
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def compute_indicators(ticker, period, interval):
+    raw = get_stock_data(ticker, period=period, interval=interval)
+    if raw.empty:
+        return raw, pd.DataFrame()
+    # Compute everything as float64 arrays and build the frame once at the
+    # end, instead of inserting columns into the yfinance DataFrame
+    close = raw['Close'].to_numpy(dtype=np.float64)
+    if talib is not None:
+        # Hand-written C implementations: one FFI call per indicator
+        macd, signal, hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+        rsi = talib.RSI(close, timeperiod=14)
+    else:
+        macd, signal, hist = _macd_kernel(close)
+        rsi = _rsi_kernel(close, 14)
+    data = pd.DataFrame({
+        'Close': close,
+        'MACD': macd,
+        'Signal Line': signal,
+        'Hist': hist,
+        'RSI': rsi,
+    }, index=raw.index, copy=False)
+    crossovers = identify_macd_crossovers(data)
+    return data, crossovers
+
+
+# Cached figure construction; go.Figure pickles by value, so reruns for the
+# same inputs reuse the built figure instead of reconstructing every trace
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def build_figure(ticker, period, interval):
+    data, _ = compute_indicators(ticker, period, interval)
+
+    # Hand Plotly plain numpy arrays so its encoder skips the Series->list conversion
+    dates = data.index.to_numpy()
+
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.02,
+                        subplot_titles=('Stock Price', 'MACD', 'RSI'),
+                        row_width=[0.2, 0.2, 0.6])
+
+    # Line chart for stock price
+    fig.add_trace(go.Scattergl(x=dates, y=data['Close'].to_numpy(), mode='lines', name='Stock Price'), row=1, col=1)
+
+    # MACD chart
+    fig.add_trace(go.Scattergl(x=dates, y=data['MACD'].to_numpy(), mode='lines', name='MACD'), row=2, col=1)
+    fig.add_trace(go.Scattergl(x=dates, y=data['Signal Line'].to_numpy(), mode='lines', name='Signal Line'), row=2, col=1)
+    fig.add_trace(go.Bar(x=dates, y=data['Hist'].to_numpy(), name='Histogram'), row=2, col=1)
+
+    # RSI chart
+    fig.add_trace(go.Scattergl(x=dates, y=data['RSI'].to_numpy(), mode='lines', name='RSI'), row=3, col=1)
+    fig.add_shape(type='line', x0=dates[0], y0=70, x1=dates[-1], y1=70,
+                  line=dict(color='Red', ), row=3, col=1)
+    fig.add_shape(type='line', x0=dates[0], y0=30, x1=dates[-1], y1=30,
+                  line=dict(color='Green', ), row=3, col=1)
+
+    fig.update_layout(height=800, showlegend=False)
+    return fig
+
+
 # Streamlit app
 st.title('Stock Analysis Dashboard')
 
@@ -77,45 +219,35 @@ with st.sidebar.expander("Learn about MACD and RSI"):
     """)
 
 if ticker:
-    # Fetch stock data
-    data = get_stock_data(ticker, period=period, interval=interval)
+    # Fetch stock data and compute indicators (cached per ticker/period/interval)
+    data, crossovers = compute_indicators(ticker, period, interval)
 
     if not data.empty:
-        # Calculate MACD and RSI
-        data = calculate_macd(data)
-        data = calculate_rsi(data)
-
-        # Identify MACD crossovers
-        crossovers = identify_macd_crossovers(data)
-
-        # Plotting
-        fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.02,
-                            subplot_titles=('Stock Price', 'MACD', 'RSI'),
-                            row_width=[0.2, 0.2, 0.6])
-
-        # Line chart for stock price
-        fig.add_trace(go.Scatter(x=data.index, y=data['Close'], mode='lines', name='Stock Price'), row=1, col=1)
-
-        # MACD chart
-        fig.add_trace(go.Scatter(x=data.index, y=data['MACD'], mode='lines', name='MACD'), row=2, col=1)
-        fig.add_trace(go.Scatter(x=data.index, y=data['Signal Line'], mode='lines', name='Signal Line'), row=2, col=1)
-        fig.add_trace(go.Bar(x=data.index, y=data['Hist'], name='Histogram'), row=2, col=1)
-
-        # RSI chart
-        fig.add_trace(go.Scatter(x=data.index, y=data['RSI'], mode='lines', name='RSI'), row=3, col=1)
-        fig.add_shape(type='line', x0=data.index[0], y0=70, x1=data.index[-1], y1=70,
-                      line=dict(color='Red', ), row=3, col=1)
-        fig.add_shape(type='line', x0=data.index[0], y0=30, x1=data.index[-1], y1=30,
-                      line=dict(color='Green', ), row=3, col=1)
-
-        fig.update_layout(height=800, showlegend=False)
+        fig = build_figure(ticker, period, interval)
         st.plotly_chart(fig, use_container_width=True)
 
         # Display crossovers in a DataFrame
-        if crossovers:
-            crossover_df = pd.DataFrame(crossovers, columns=['Date', 'Close Price', 'Type'])
+        if not crossovers.empty:
+            changes = calculate_price_changes(data).reindex(crossovers.index)
+            crossover_df = pd.concat([crossovers, changes], axis=1)
+            crossover_df.insert(0, 'Date', crossover_df.index.strftime('%Y-%m-%d'))
+            crossover_df = crossover_df.reset_index(drop=True)
+
+            # Color the percent cells elementwise on the numeric values
+            def _color(value):
+                if value > 0:
+                    return 'color: green'
+                if value < 0:
+                    return 'color: red'
+                return ''
+
+            pct_cols = list(changes.columns)
+            styled_crossovers = crossover_df.style.applymap(_color, subset=pct_cols)
             st.subheader('MACD Crossovers')
-            st.dataframe(crossover_df)
+            st.dataframe(styled_crossovers, column_config={
+                'Close Price': st.column_config.NumberColumn(format='$%.2f'),
+                **{col: st.column_config.NumberColumn(format='%+.2f%%') for col in pct_cols},
+            })
     else:
         st.error('Invalid stock symbol or no data available.')
 else: